@@ -1,10 +1,9 @@
 from abc import ABC
-from enum import Enum
-from pydoc import text
+from enum import IntEnum, auto
+from functools import lru_cache
 import re
-from token import COMMENT
-from typing import List, Optional, Union, Tuple, Any, Dict, Set
-from typing import Literal as tLiteral
+import sys
+from typing import List, Optional, Union, Tuple, Any, Dict, FrozenSet, Sequence
 
 
 # ==============================================
@@ -12,92 +11,99 @@ from typing import Literal as tLiteral
 # ==============================================
 
 # Enums
-class NodeType(Enum):
-    """Comprehensive node types for the Espresso language AST."""
-
-    NEWLINE     = "NEWLINE"
-    INDENT = "INDENT"
-    IDENTIFIER = "IDENTIFIER"
-    BODY = "BODY"
-    COMMENT = "COMMENT"
-
-    CPP_BLOCK = "CPP_BLOCK"
-
-    ANNOTATION_DEFINE = "ANNOTATION_DEFINE"
-    ANNOTATION_ASSERT = "ANNOTATION_ASSERT"
-    ANNOTATION_IO = "ANNOTATION_IO"
-    ANNOTATION_SAFE = "ANNOTATION_SAFE"
-    ANNOTATION_UNSAFE = "ANNOTATION_UNSAFE"
-    ANNOTATION_PANIC = "ANNOTATION_PANIC"
-    ANNOTATION_NAMESPACE = "ANNOTATION_NAMESPACE"
-
-
-    PRIVATEModifier = "PRIVATEModifier"
-    PUBLICModifier = "PUBLICModifier"
-    PROTECTEDModifier = "PROTECTEDModifier"
-    CONSTModifier = "CONSTModifier"
-    CONSTEXPRModifier = "CONSTEXPRModifier"
-    CONSTEVALModifier = "CONSTEVALModifier"
-    STATICModifier = "STATICModifier"
-    ABSTRACTModifier = "ABSTRACTModifier"
-    OVERRIDEModifier = "OVERRIDEModifier"
-    VIRTUALModifier = "VIRTUALModifier"
-    POINTERModifier = "POINTERModifier"
-    REFERENCEModifier = "REFERENCEModifier"
-
-    VAR_DECLARE_ASSIGN = "VAR_DECLARE_ASSIGN"
-    VAR_DECLARE = "VAR_DECLARE"
-    VAR_ASSIGN = "VAR_ASSIGN"
-    MULTI_VAR_DECLARE = "MULTI_VAR_DECLARE"
-    MULTI_VAR_ASSIGN = "MULTI_VAR_ASSIGN"
-
-    COMPARISON = "COMPARISON"
-    CONDITION = "CONDITION"
-    EXPRESSION_BINARY = "EXPRESSION_BINARY"
-    EXPRESSION_UNARY = "EXPRESSION_UNARY"
-
-    NUMERICLiteral = "NUMERICLiteral"
-    LISTLiteral = "LISTLiteral"
-    MAPLiteral = "MAPLiteral"
-    STRINGLiteral = "STRINGLiteral"
-    RAW_STRINGLiteral = "RAW_STRINGLiteral"
-    F_STRINGLiteral = "F_STRINGLiteral"
-    BOOLLiteral = "BOOLLiteral"
-    VOIDLiteral = "VOIDLiteral"
-    NULLPTRLiteral = "NULLPTRLiteral"
-
-    FUNC_PARAM = "FUNC_PARAM"
-    FUNC_CALL_PARAM = "FUNC_CALL_PARAM"
-    FUNCTION_DECL = "FUNCTION_DECL"
-    FUNCTION_CALL = "FUNCTION_CALL"
-    LAMBDA_EXPR = "LAMBDA_EXPR"
-    RETURN = "RETURN"
-    NULLPTRLiteral
-    GENERIC_PARAM = "GENERIC_PARAM"
-    CLASS_DEFINE = "CLASS_DEFINE"
-    CLASS_INSTANTIATION = "CLASS_INSTANTIATION"
-    CLASS_DIVIDER = "CLASS_DIVIDER"
-
-    IF_EXPR = "IF_EXPR"
-    TERNARY_EXPR = "TERNARY_EXPR"
-    MATCH_EXPR = "MATCH_EXPR"
-
-    WHILE_LOOP = "WHILE_LOOP"
-    FOR_IN_LOOP = "FOR_IN_LOOP"
-    C_STYLE_FOR_LOOP = "C_STYLE_FOR_LOOP"
-    CONTINUE = "CONTINUE"
-    BREAK = "BREAK"
-
-    TRY_CATCH = "TRY_CATCH"
-    THROW = "THROW"
+class NodeType(IntEnum):
+    """Comprehensive node types for the Espresso language AST.
+    Members are small ints so comparing and hashing them stays in C."""
+
+    NEWLINE     = auto()
+    INDENT = auto()
+    IDENTIFIER = auto()
+    BODY = auto()
+    COMMENT = auto()
+
+    CPP_BLOCK = auto()
+
+    ANNOTATION_DEFINE = auto()
+    ANNOTATION_ASSERT = auto()
+    ANNOTATION_IO = auto()
+    ANNOTATION_SAFE = auto()
+    ANNOTATION_UNSAFE = auto()
+    ANNOTATION_PANIC = auto()
+    ANNOTATION_NAMESPACE = auto()
+
+
+    PRIVATEModifier = auto()
+    PUBLICModifier = auto()
+    PROTECTEDModifier = auto()
+    CONSTModifier = auto()
+    CONSTEXPRModifier = auto()
+    CONSTEVALModifier = auto()
+    STATICModifier = auto()
+    ABSTRACTModifier = auto()
+    OVERRIDEModifier = auto()
+    VIRTUALModifier = auto()
+    POINTERModifier = auto()
+    REFERENCEModifier = auto()
+
+    VAR_DECLARE_ASSIGN = auto()
+    VAR_DECLARE = auto()
+    VAR_ASSIGN = auto()
+    MULTI_VAR_DECLARE = auto()
+    MULTI_VAR_ASSIGN = auto()
+
+    COMPARISON = auto()
+    CONDITION = auto()
+    EXPRESSION_BINARY = auto()
+    EXPRESSION_UNARY = auto()
+
+    NUMERICLiteral = auto()
+    LISTLiteral = auto()
+    MAPLiteral = auto()
+    STRINGLiteral = auto()
+    RAW_STRINGLiteral = auto()
+    F_STRINGLiteral = auto()
+    BOOLLiteral = auto()
+    VOIDLiteral = auto()
+    NULLPTRLiteral = auto()
+
+    FUNC_PARAM = auto()
+    FUNC_CALL_PARAM = auto()
+    FUNCTION_DECL = auto()
+    FUNCTION_CALL = auto()
+    LAMBDA_EXPR = auto()
+    RETURN = auto()
+    GENERIC_PARAM = auto()
+    CLASS_DEFINE = auto()
+    CLASS_INSTANTIATION = auto()
+    CLASS_DIVIDER = auto()
+
+    IF_EXPR = auto()
+    TERNARY_EXPR = auto()
+    MATCH_EXPR = auto()
+    SWITCH = auto()
+    CASE = auto()
+
+    WHILE_LOOP = auto()
+    FOR_IN_LOOP = auto()
+    C_STYLE_FOR_LOOP = auto()
+    CONTINUE = auto()
+    BREAK = auto()
+
+    TRY_CATCH = auto()
+    THROW = auto()
 
 # ==, <=, >=, !=, >, < operators
-ConditionOperators: Set = {
-
-}
+ConditionOperators: FrozenSet[str] = frozenset({
+    "==",   # Equal
+    "<=",   # Less or Equal
+    ">=",   # More or Equal
+    "!=",   # Not Equal
+    ">",    # Greater
+    "<"     # Less
+})
 
 # Binary operators for arithmetic and bitwise operations
-BinaryOperators: Set = {
+BinaryOperators: FrozenSet[str] = frozenset({
     "+",    # Addition
     "-",    # Subtraction
     "*",    # Multiplication
@@ -126,14 +132,20 @@ BinaryOperators: Set = {
     "!=",   # Not Equal
     ">",    # Greater
     "<"     # Less
-}
+})
 
-UnaryOperators: Set = {
+UnaryOperators: FrozenSet[str] = frozenset({
     "!",     # Logical NOT
     "-",     # Negation
     "+",     # Unary Plus
     "~"      # Bitwise NOT
-}
+})
+
+# Espresso unary operators spelled differently in C++
+_UNARY_CXX: Dict[str, str] = {"not": "!"}
+
+# " op " for each binary operator, shared by every expression using it
+_SPACED_OPS: Dict[str, str] = {op: f" {op} " for op in BinaryOperators}
 
 # list<int> -> ListWrapper<IntWrapper>
 TYPE_MAP : dict = {
@@ -172,40 +184,32 @@ TYPE_MAP : dict = {
     "lambda"    : "LambdaWrapper" # Lambda type
 }
 
+# Type names (anything up to a bracket, comma or space) and the `<`, `>`, `,` separators
+_TYPE_TOKEN = re.compile(r'[^<>,\s]+|[<>,]')
+
+# The same handful of type strings recur throughout a program, so cache them
+@lru_cache(maxsize=8192)
 def ConvertType(espresso_type: str) -> str:
-    s = espresso_type.strip()
-    out = []
-    word = ''
-    stack = []
-
-    def dump_word():
-        nonlocal word
-        if word:
-            # Map base types, otherwise treat as custom class
-            mapped = TYPE_MAP.get(word.strip(), word.strip())
-            out.append(mapped)
-            word = ''
-
-    for c in s:
-        if c == '<':
-            dump_word()
-            out.append('<')
-            stack.append('[')
-        elif c == '>':
-            dump_word()
-            out.append('>')
-            if not stack or stack.pop() != '[':
+    out: List[str] = []
+    append = out.append
+    lookup = TYPE_MAP.get
+    depth = 0
+    for tok in _TYPE_TOKEN.findall(espresso_type):
+        if tok == '<':
+            append('<')
+            depth += 1
+        elif tok == '>':
+            if not depth:
                 raise ValueError("Unmatched brackets")
-        elif c == ',':
-            dump_word()
-            out.append(', ')
-        elif c.isspace():
-            dump_word()
+            append('>')
+            depth -= 1
+        elif tok == ',':
+            append(', ')
         else:
-            word += c
+            # Map base types, otherwise treat as custom class
+            append(lookup(tok, tok))
 
-    dump_word()
-    if stack:
+    if depth:
         raise ValueError("Unmatched brackets")
     return ''.join(out)
 
@@ -214,6 +218,9 @@ def ConvertType(espresso_type: str) -> str:
 # Abstract Syntax Tree
 # ==============================================
 
+# Shared stand-in for "no modifiers", so modifier-less nodes don't each allocate a list
+_NO_MODIFIERS: Tuple["Modifier", ...] = ()
+
 # Base AST Node
 class ASTNode(ABC):
     """Base class for all AST nodes.
@@ -223,6 +230,11 @@ class ASTNode(ABC):
         body (Optional["Body"]): The body of the node, if applicable.
         modifiers (Optional[List[Modifier]]): List of modifiers associated with the node.
     """
+    __slots__ = ('node_type', 'value', 'body', 'modifiers')
+
+    # Whether a bare statement of this node needs a trailing `;` (set per class)
+    _needs_semicolon: bool = False
+
     def __init__(self, 
                  node_type: NodeType,
                  value: Optional[Any] = None,
@@ -232,73 +244,248 @@ class ASTNode(ABC):
         self.node_type: NodeType = node_type
         self.value: Optional[Any] = value
         self.body: Optional["Body"] = body
-        self.modifiers: Optional[List["Modifier"]] = modifiers if modifiers is not None else []
+        self.modifiers: Sequence["Modifier"] = tuple(modifiers) if modifiers else _NO_MODIFIERS
 
-    def __hash__(self):
-        return hash((self.node_type, self.value, tuple(self.modifiers), self.body))
-    
-    def __repr__(self):
-        return f"{self.__class__.__name__}(type={self.node_type}, value={self.value}, body={self.body}, modifiers={self.modifiers})"
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(type=NodeType.{self.node_type.name}, value={self.value}, body={self.body}, modifiers={self.modifiers})"
     
     def To_CXX(self) -> str:
         """Convert the AST node to its C++ code representation."""
-        raise NotImplementedError("To_CXX method must be implemented in subclasses")
+        if type(self)._parts is ASTNode._parts:
+            raise NotImplementedError("To_CXX method must be implemented in subclasses")
+        out: List[str] = []
+        _emit_iter(self, out)
+        return ''.join(out)
+
+    def _parts(self) -> Optional[List[Any]]:
+        """The strings, child nodes and bodies that make up this node's C++ code, in order.
+        Leaf nodes return None and are rendered with their own `To_CXX`."""
+        return None
+
+    def emit(self, out: List[str]) -> None:
+        """Append the C++ code for this node to a shared output buffer."""
+        _emit_iter(self, out)
 
 # Base class for all value-producing expressions (literals, variables, operations, etc.)
 class Value(ASTNode, ABC):
     """Base class for all value-producing expressions (literals, variables, operations, etc.)"""
-    pass
+    __slots__ = ()
+    _needs_semicolon = True
+
+# Mixin for nodes that carry no per-instance state (newline, void, break, ...)
+class _Stateless():
+    """Mixin for stateless nodes: every construction returns the class's one shared instance.
+    Only the first construction initializes it, and it cannot be changed afterwards."""
+    __slots__ = ()
+
+    def __new__(cls):
+        shared = cls.__dict__.get("_shared")
+        if shared is None:
+            shared = super().__new__(cls)
+        return shared
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        cls = type(self)
+        if cls.__dict__.get("_shared") is None:
+            super().__init__(*args, **kwargs)
+            cls._shared = self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if type(self).__dict__.get("_shared") is self:
+            raise AttributeError(f"{type(self).__name__} nodes are shared and cannot be modified")
+        super().__setattr__(name, value)
+
+# Mixin for declarations whose header text is rendered once and reused
+class _HeaderCache():
+    """Mixin for nodes that render `_signature()` on first emit and keep it in `_header`.
+    Assigning any other attribute drops the cached text, so later edits are still emitted."""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != '_header':
+            object.__setattr__(self, '_header', None)
+
+    def _cached_header(self) -> str:
+        header = self._header
+        if header is None:
+            header = self._header = self._signature()
+        return header
 
 # Base class for all annotations (@namespace, @define, etc.)
 class Annotation(ASTNode):
     """Base class for annotations"""
-    pass
+    __slots__ = ()
 
 # Base class for all modifiers (private, static, etc.)
 class Modifier(ASTNode):
     """Base class for all `@` modifiers"""
-    pass
+    __slots__ = ()
 
 # Base class for all expression types (binary, unary, etc.)
 class Expression(Value, ASTNode):
     """Base class for all expression types"""
-    pass
+    __slots__ = ()
 
 # Base class for all literal types (numeric, string, etc.)
 class Literal(Value, ASTNode):
     """Base class for all literal types (numeric, string, etc.)"""
-    pass
+    __slots__ = ()
+
 
+# "    " * level, precomputed for the usual nesting depths
+_INDENTS: Tuple[str, ...] = tuple("    " * i for i in range(64))
+
+def _indent(level: int) -> str:
+    # Negative levels fall through to "    " * level, which is "" as before
+    return _INDENTS[level] if 0 <= level < len(_INDENTS) else "    " * level
 
 # Blocks
 class Body():
+    __slots__ = ('indent_level', 'children')
+
     def __init__(self, statements: List[ASTNode], indent_level: int = 1):
         self.indent_level = indent_level
-        self.children = statements if isinstance(statements, List) else statements.children if isinstance(statements, Body) else [] 
+        kind = type(statements)
+        if kind is list:
+            self.children = statements
+        elif kind is Body:
+            self.children = statements.children
+        elif statements is None:
+            self.children = []
+        else:
+            # tuples and other iterables used to be dropped silently
+            self.children = list(statements)
 
     def add_statement(self, statement: ASTNode) -> None:
         """Add a statement to the body."""
         self.children.append(statement)
 
+    def emit(self, out: List[str]) -> None:
+        _emit_iter(self, out)
+
     def To_CXX(self) -> str:
-        indent = "    " * self.indent_level
-        lines = []
-        for stmt in self.children:
-            if hasattr(stmt, 'To_CXX'):
-                content = stmt.To_CXX()
-                # Add semicolon for expression statements
-                if isinstance(stmt, (Value, FunctionCall)) and not content.endswith(';'):
-                    content += ';'
+        out: List[str] = []
+        _emit_iter(self, out)
+        return ''.join(out)
+
+class _LazyBody():
+    """Body attribute backed by an existing slot: it stays None until first read,
+    which stores an empty Body. Emitters use `peek` so untouched bodies are never built."""
+    __slots__ = ('storage', 'slot', 'indent_level')
+
+    def __init__(self, storage: str, indent_level: int = 1):
+        self.storage = storage
+        self.slot: Any = None
+        self.indent_level = indent_level
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        # The backing slot may be the one this descriptor shadows, so look past it
+        for klass in owner.__mro__:
+            slot = klass.__dict__.get(self.storage)
+            if slot is not None and slot is not self:
+                self.slot = slot
+                return
+        raise TypeError(f"{owner.__name__} has no slot {self.storage!r}")
+
+    def peek(self, node: Any) -> Optional["Body"]:
+        """The stored body, or None if it was never built."""
+        return self.slot.__get__(node)
+
+    def __get__(self, node: Any, owner: Any = None) -> Any:
+        if node is None:
+            return self
+        body = self.slot.__get__(node)
+        if body is None:
+            body = Body([], self.indent_level)
+            self.slot.__set__(node, body)
+        return body
+
+    def __set__(self, node: Any, value: Optional["Body"]) -> None:
+        self.slot.__set__(node, value)
+
+class _StmtStart():
+    """Emit-stack marker: a body statement starts at the current end of the buffer."""
+    __slots__ = ()
+
+class _StmtEnd():
+    """Emit-stack marker: finish a body statement (semicolon + indentation)."""
+    __slots__ = ('stmt', 'newline')
+
+    def __init__(self, stmt: Any, newline: str):
+        self.stmt = stmt
+        self.newline = newline
+
+_STMT_START = _StmtStart()
+
+def _emit_iter(root: Union[ASTNode, Body], out: List[str]) -> None:
+    """Write the C++ code for `root` into `out` with an explicit stack instead of recursion.
+
+    Strings on the stack are copied to the buffer, nodes are expanded through `_parts()`,
+    and a body pushes each of its statements between a start and an end marker so the
+    statement's text can be indented once it is complete."""
+    stack: List[Any] = [root]
+    marks: List[int] = []
+    pop = stack.pop
+    push = stack.append
+    append = out.append
+    while stack:
+        item = pop()
+        cls = type(item)
+        if cls is str:
+            append(item)
+        elif cls is _StmtStart:
+            marks.append(len(out))
+        elif cls is _StmtEnd:
+            start = marks.pop()
+            content = ''.join(out[start:])
+            # Add semicolon for expression statements
+            if item.stmt._needs_semicolon and not content.endswith(';'):
+                content += ';'
+            out[start:] = (content.replace("\n", item.newline) if "\n" in content else content,)
+        elif cls is Body:
+            if not item.children:
+                # e.g. an empty catch or function body: nothing to indent
+                continue
+            indent = _indent(item.indent_level)
+            newline = "\n" + indent
+            sep = indent
+            frames = []
+            for stmt in item.children:
+                if isinstance(stmt, ASTNode) and type(stmt)._parts is not ASTNode._parts:
+                    frames.append((stmt, sep, newline))
+                else:
+                    # Leaf statements have no children to walk: render them right away
+                    if hasattr(stmt, 'To_CXX'):
+                        content = stmt.To_CXX()
+                        if getattr(stmt, '_needs_semicolon', False) and not content.endswith(';'):
+                            content += ';'
+                    else:
+                        content = str(stmt)
+                    frames.append((None, sep, content.replace("\n", newline) if "\n" in content else content))
+                sep = newline
+            for stmt, sep, rest in reversed(frames):
+                if stmt is None:
+                    push(rest)
+                else:
+                    push(_StmtEnd(stmt, rest))
+                    push(stmt)
+                    push(_STMT_START)
+                push(sep)
+        else:
+            parts = item._parts()
+            if parts is None:
+                append(item.To_CXX())
             else:
-                content = str(stmt)
-            stmt_lines = content.split('\n')
-            lines.extend(f"{indent}{line}" for line in stmt_lines)
-        return '\n'.join(lines)
+                stack.extend(reversed(parts))
 
 class CPPBlock(ASTNode):
+    __slots__ = ()
+
     def __init__(self, text: str):
         super().__init__(NodeType.CPP_BLOCK, text)
 
+    @staticmethod
     def _clean_block(block: str) -> str:
         # Preserve comment markers and avoid stripping content too aggressively.
         if not block:
@@ -338,7 +525,7 @@ class CPPBlock(ASTNode):
 
         return "\n".join(new_lines).rstrip()
 
-    def To_CXX(self):
+    def To_CXX(self) -> str:
         return self._clean_block(self.value)
 
 class Program():
@@ -353,12 +540,15 @@ class Program():
     def To_CXX(self) -> str:
         includes_str = '\n'.join(self.includes)
         self.body.indent_level = 0
-        body_str = self.body.To_CXX()
-        return f"{includes_str}\n\n{body_str}"
+        out: List[str] = [includes_str, "\n\n"]
+        self.body.emit(out)
+        return ''.join(out)
 
 # Newline Node
-class NewLine(ASTNode):
+class NewLine(_Stateless, ASTNode):
     """Represents a newline in the source code."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.NEWLINE, value="\n")
 
@@ -367,6 +557,8 @@ class NewLine(ASTNode):
 
 class Comment(ASTNode):
     """Represents a comment in the source code."""
+    __slots__ = ()
+
     def __init__(self, text: str):
         super().__init__(NodeType.COMMENT, value=text)
 
@@ -381,55 +573,75 @@ class Comment(ASTNode):
 
 class IsPrivateModifier(Modifier):
     """Private Modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.PRIVATEModifier)
 
 class IsPublicModifier(Modifier):
     """Private Modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.PUBLICModifier)
 
 class IsProtectedModifier(Modifier):
     """Private Modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.PROTECTEDModifier)
 
 class IsConstModifier(Modifier):
     """Const/immutable modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.CONSTModifier)
 
 class IsConstexprModifier(Modifier):
     """Const/immutable modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.CONSTEXPRModifier)
 
 class IsConstevalModifier(Modifier):
     """Const/immutable modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.CONSTEVALModifier)
 
 class IsStaticModifier(Modifier):
     """Static/class-level modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.STATICModifier)
 
 class IsAbstractModifier(Modifier):
     """Abstract class/method modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.ABSTRACTModifier)
 
 class IsOverrideModifier(Modifier):
     """Override class/method modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.OVERRIDEModifier)
 
 class IsVirtualModifier(Modifier):
     """Virtual class/method modifier"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.VIRTUALModifier)
 
-MOD_MAP: Dict = {
+MOD_MAP: Dict[type, str] = {
     IsPrivateModifier: "private",
     IsPublicModifier: "public",
     IsProtectedModifier: "protected",
@@ -444,26 +656,35 @@ MOD_MAP: Dict = {
 
 def ConvertModifier(modifier: Modifier) -> str:
     """Convert a modifier to its C++ string representation."""
-    if type(modifier) in MOD_MAP:
-        return MOD_MAP[type(modifier)]
-    raise ValueError(f"Unknown modifier type: {type(modifier)}")
+    cxx = MOD_MAP.get(type(modifier))
+    if cxx is None:
+        raise ValueError(f"Unknown modifier type: {type(modifier)}")
+    return cxx
+
+def _join_modifiers(modifiers: Sequence[Modifier]) -> str:
+    """Space-separated C++ keywords for `modifiers` ("" when there are none)."""
+    return ' '.join([ConvertModifier(m) for m in modifiers]) if modifiers else ""
 
 
 class AnnotationDefine(Annotation):
     """Represents a DEFINE annotation."""
+    __slots__ = ('name',)
+
     def __init__(
             self, 
             name: Union[str, "Identifier"],
             value: "Literal"):
         super().__init__(NodeType.ANNOTATION_DEFINE, value=value)
         self.value = value
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
+        self.name = _as_id(name)
 
     def To_CXX(self) -> str:
         return f"#DEFINE {self.name.To_CXX()} {self.value.To_CXX()}"
 
 class AnnotationAssert(Annotation):
     """Represents an ASSERT annotation that generates runtime checks."""
+    __slots__ = ('condition',)
+
     def __init__(self, condition: "Value"):
         super().__init__(NodeType.ANNOTATION_ASSERT)
         self.condition = condition
@@ -476,51 +697,62 @@ class AnnotationAssert(Annotation):
     
 class AnnotationIO(Annotation):
     """Represents an IO operation"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.ANNOTATION_IO)
 
-    def To_CXX(self):
+    def To_CXX(self) -> str:
         return "//IO:"
 
 class AnnotationSafe(Annotation):
     """Unsafe operations"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.ANNOTATION_SAFE)
 
-    def To_CXX(self):
+    def To_CXX(self) -> str:
         return f"//SAFE:\n"
 
 class AnnotationUnsafe(Annotation):
     """Unsafe operations"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.ANNOTATION_UNSAFE)
 
-    def To_CXX(self):
+    def To_CXX(self) -> str:
         return f"//UNSAFE:\n"
 
 #
 class AnnotationPanic(Annotation):
     """Intentional Crash"""
+    __slots__ = ()
+
     def __init__(self, value: "Literal"):
         super().__init__(NodeType.ANNOTATION_PANIC, value=value)
 
-    def To_CXX(self):
+    def To_CXX(self) -> str:
         return f"abort({self.value})"
 
 # `@namespace std {...}``
 class AnnotationNamespace(Annotation):
     """Nampespace"""
+    __slots__ = ()
+
     def __init__(self, ns_name: Union[str, "Identifier"], children: Union[List["ASTNode"], "Body"]):
-        super().__init__(NodeType.ANNOTATION_NAMESPACE, value=ns_name if isinstance(ns_name, Identifier) else Identifier(ns_name))
+        super().__init__(NodeType.ANNOTATION_NAMESPACE, value=_as_id(ns_name))
         self.body = children if isinstance(children, Body) else Body(children or [], 1)
 
-    def To_CXX(self):
+    def _parts(self) -> List[Any]:
         ns_name = self.value.To_CXX() if self.value is not None else ""
-        return f"namespace {ns_name} {{\n{self.body.To_CXX()}\n}}"
+        return [f"namespace {ns_name} {{\n", self.body, "\n}"]
     
 # `using namespace std`
 class AnnotationUsingNamespace(Annotation):
     """Using a Namespace"""
+    __slots__ = ()
 
 
 
@@ -531,111 +763,149 @@ class AnnotationUsingNamespace(Annotation):
 # Variable name
 class Identifier(Value, ASTNode):
     """Represents an identifier in the source code."""
+    __slots__ = ('_cxx',)
+    # Shared instances for names that were already seen (see `intern`)
+    _pool: Dict[str, "Identifier"] = {}
+    _POOL_LIMIT: int = 4096
+
     def __init__(self, value: str):
         super().__init__(NodeType.IDENTIFIER, value=value)
+        # Interned: the same names come back as ConvertType cache keys
+        self._cxx = sys.intern(str(value).strip())
+
+    @classmethod
+    def intern(cls, value: str) -> "Identifier":
+        """Return a shared Identifier for `value`, creating it on first use.
+        Identifiers are never mutated after construction, so sharing them is safe.
+        Only `str` names are pooled; `True`, `1` and `1.0` would collide as keys."""
+        if type(value) is not str:
+            return cls(value)
+        ident = cls._pool.get(value)
+        if ident is None:
+            ident = cls(value)
+            if len(cls._pool) < cls._POOL_LIMIT:
+                cls._pool[value] = ident
+        return ident
 
     def To_CXX(self) -> str:
-        return str(self.value).strip()
+        return self._cxx
+
+def _as_id(name: Any) -> Identifier:
+    """Coerce `name` to an Identifier, passing existing Identifiers through.
+    Other values are interned by their text, so `True` gives `True`, not a pooled `1`."""
+    if type(name) is Identifier:
+        return name
+    return name if isinstance(name, Identifier) else Identifier.intern(str(name))
 
 # Binary Expression Nodes (arithmetic, bitwise)
 class BinaryExpression(Expression):
     """Represents binary operations (+, -, *, /, %, &, |, ^, <<, >>, &&, ||)"""
+    __slots__ = ('left', 'op', 'right')
+    _OPS: FrozenSet[str] = BinaryOperators
+
     def __init__(self, left: ASTNode, op: str, right: ASTNode):
-        if op not in BinaryOperators:
+        if op not in self._OPS:
             raise ValueError(f"Invalid binary operator: {op}")
         super().__init__(NodeType.EXPRESSION_BINARY)
         self.left = left
         self.op = op
         self.right = right
 
-    def To_CXX(self) -> str:
-        return f"{self.left.To_CXX()} {self.op} {self.right.To_CXX()}".strip()
+    def _parts(self) -> List[Any]:
+        return [self.left, _SPACED_OPS[self.op], self.right]
 
 # Unary Expression Nodes (unary operations like !, -, +, ~)
 class UnaryExpression(Expression):
     """Represents unary operations (!, -, +, ~)"""
+    __slots__ = ('op', 'operand')
+
     def __init__(self, op: str, operand: ASTNode):
         super().__init__(NodeType.EXPRESSION_UNARY)
         self.op = op
         self.operand = operand
 
-    def To_CXX(self) -> str:
-        # Handle special case for 'not' which we map to '!'
-        op = '!' if self.op == 'not' else self.op
-        return f"{op}{self.operand.To_CXX()}".strip()
+    def _parts(self) -> List[Any]:
+        # 'not' maps to '!', everything else is already C++
+        return [_UNARY_CXX.get(self.op, self.op), self.operand]
 
 class UnaryIncrementExpression(Expression):
     """Represents unary increment/decrement operations (++, --)"""
+    __slots__ = ('op', 'operand', 'is_prefix')
+
     def __init__(self, op: str, operand: ASTNode, is_prefix: bool = True):
         super().__init__(NodeType.EXPRESSION_UNARY)
         self.op = op
         self.operand = operand
         self.is_prefix = is_prefix
 
-    def To_CXX(self) -> str:
+    def _parts(self) -> List[Any]:
         if self.is_prefix:
-            return f"{self.op}{self.operand.To_CXX()}".strip()
-        else:
-            return f"{self.operand.To_CXX()}{self.op}".strip()
+            return [self.op, self.operand]
+        return [self.operand, self.op]
 
 class VarDeclareAssign(ASTNode):
+    __slots__ = ('var_name', 'var_type', 'colon')
+
     def __init__(self, 
                  var_name: Identifier,
                  var_type: Optional[Identifier] = None,
-                 modifiers: Optional[List[Modifier]] = [],
+                 modifiers: Optional[List[Modifier]] = None,
                  value: Optional[Value] = None,
                  colon: bool = True):
         super().__init__(NodeType.VAR_DECLARE_ASSIGN, modifiers=modifiers)
         self.var_name = var_name
         self.var_type = var_type
         self.value = value
-        self.modifiers = modifiers or []
         self.colon = colon
 
     def To_CXX(self) -> str:
         parts = []
         if self.modifiers:
-            parts.append(' '.join(ConvertModifier(m) for m in self.modifiers))
-        parts.append(ConvertType(self.var_type.To_CXX()).strip())
+            parts.append(_join_modifiers(self.modifiers))
+        parts.append(ConvertType(self.var_type.To_CXX()))
         parts.append(self.var_name.To_CXX())
         if self.value:
             parts.append(f"= {self.value.To_CXX()}")
         return ' '.join(parts) + (';' if self.colon else '')
 
 class MultiVarDeclare(ASTNode):
+    __slots__ = ('var_names', 'var_type')
+
     def __init__(self,
                 var_names: List[Identifier], 
                 var_type: Identifier, 
-                modifiers: List[Modifier] = []):
+                modifiers: Optional[List[Modifier]] = None):
         super().__init__(NodeType.MULTI_VAR_DECLARE, modifiers=modifiers)
-        self.var_names = var_names
-        self.var_type = var_type
+        self.var_names = tuple(map(_as_id, var_names))
+        self.var_type = _as_id(var_type)
 
     def To_CXX(self) -> str:
         parts = []
         if self.modifiers:
-            parts.append(' '.join(ConvertModifier(m) for m in self.modifiers))
-        parts.append(ConvertType(self.var_type.To_CXX()).strip())
-        parts.append(', '.join(var.To_CXX() for var in self.var_names))
+            parts.append(_join_modifiers(self.modifiers))
+        parts.append(ConvertType(self.var_type.To_CXX()))
+        parts.append(', '.join([var.To_CXX() for var in self.var_names]))
         return ' '.join(parts) + ';'
 
 class MultiVarAssign(ASTNode):
+    __slots__ = ('var_names', 'var_type')
+
     def __init__(self,
                 var_names: List[Identifier],
                 value: Value,
                 var_type: Identifier, 
-                modifiers: List[Modifier] = []):
+                modifiers: Optional[List[Modifier]] = None):
         super().__init__(NodeType.MULTI_VAR_ASSIGN, modifiers=modifiers)
-        self.var_names = var_names
-        self.var_type = var_type
+        self.var_names = tuple(map(_as_id, var_names))
+        self.var_type = _as_id(var_type)
         self.value = value
 
     def To_CXX(self) -> str:
         parts = []
         if self.modifiers:
-            parts.append(' '.join(ConvertModifier(m) for m in self.modifiers))
-        parts.append(ConvertType(self.var_type.To_CXX()).strip())
-        parts.append(', '.join(var.To_CXX() for var in self.var_names))
+            parts.append(_join_modifiers(self.modifiers))
+        parts.append(ConvertType(self.var_type.To_CXX()))
+        parts.append(', '.join([var.To_CXX() for var in self.var_names]))
         parts.append(f"= {self.value.To_CXX()}")
         return ' '.join(parts) + ';'
 
@@ -646,17 +916,23 @@ class MultiVarAssign(ASTNode):
 # `1, 0.6, 0xDEADBEEF`
 class NumericLiteral(Literal):
     """Minimal numeric literal that passes through with C++ suffixes"""
+    __slots__ = ('rawValue', '_cxx')
+
     def __init__(self, value: str):
         super().__init__(NodeType.NUMERICLiteral)
         self.rawValue = value.strip()
+        # Literals never change after construction, so render them once
+        self._cxx = self.rawValue.replace('_', '')
 
     def To_CXX(self) -> str:
         """Pass through with underscores removed"""
-        return self.rawValue.replace('_', '')
+        return self._cxx
 
 # `{1, 0.6, 0xDEADBEEF}`
 class VectorLiteral(Literal):
     """Base class for list/set/tuple literals using uniform {} syntax"""
+    __slots__ = ('items', 'delims')
+
     def __init__(self, items: List[ASTNode], delims : str = "{}"):
         assert delims in ["()", "{}"], f"Unknown demlimiter {delims}"
         super().__init__(NodeType.LISTLiteral)  # We'll reuse this node type
@@ -664,67 +940,86 @@ class VectorLiteral(Literal):
         self.delims = delims
 
     def To_CXX(self) -> str:
-        items_str = ", ".join(item.To_CXX() for item in self.items)
+        items_str = ", ".join([item.To_CXX() for item in self.items])
         return f"{self.delims[0]}{items_str}{self.delims[1]}"
 
 # `{{"Renz", 1}, {"Henry Lee Hu", 2}}`
 class MapLiteral(Literal):
     """Base class for map literals using {{key, value}} syntax"""
+    __slots__ = ('pairs',)
+
     def __init__(self, pairs: List[Tuple[ASTNode, ASTNode]]):
         super().__init__(NodeType.MAPLiteral)  # We'll reuse this node type
         self.pairs = pairs
 
     def To_CXX(self) -> str:
         pairs_str = ", ".join(
-            f"{{{key.To_CXX()}, {value.To_CXX()}}}"
-            for key, value in self.pairs
+            [f"{{{key.To_CXX()}, {value.To_CXX()}}}"
+             for key, value in self.pairs]
         )
         return f"{{{pairs_str}}}"
 
+# C++ escapes for a regular string literal, applied in a single pass
+_STRING_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\t': '\\t'})
+
 # `"Hello, World!"`
 class NormalStringLiteral(Literal):
     """Regular string literal with escape sequences"""
+    __slots__ = ('_cxx',)
+
     def __init__(self, value: str):
         super().__init__(NodeType.STRINGLiteral, value)
+        # Escaped C++ string literal, built once since the value never changes
+        self._cxx = f'"{value.translate(_STRING_ESCAPES)}"'
 
     def To_CXX(self) -> str:
-        # Remove the repr() and just escape the string
-        escaped = (self.value
-                .replace('\\', '\\\\')
-                .replace('"', '\\"')
-                .replace('\n', '\\n')
-                .replace('\t', '\\t'))
-        return f'"{escaped}"'  # Keep as C++ string literal
+        return self._cxx
 
 # `r"Hello\nWorld"`
 class RawStringLiteral(Literal):
     """Raw string literal (no escape processing)"""
+    __slots__ = ('_cxx',)
+
     def __init__(self, value: str):
         super().__init__(NodeType.RAW_STRINGLiteral, value)
+        self._cxx = f'R"({value})"'
 
     def To_CXX(self) -> str:
-        return f'R"({self.value})"'
+        return self._cxx
+
+# $"..." / $'...' wrapper around an interpolated string
+_FSTRING_QUOTES = re.compile(r'^\$([\'"])(.*)\1$', re.S)
+# A {placeholder} (braces may nest up to three deep), a run of literal text, or a lone `{`
+# (a lone `{` falls back to a brace-counting scan for deeper placeholders)
+_FSTRING_PART = re.compile(r'\{((?:[^{}]|\{(?:[^{}]|\{[^{}]*\})*\})*)\}|[^{]+|\{')
+# Literal text of a format string: double the braces, escape for a C++ string literal
+_FORMAT_ESCAPES = str.maketrans({'{': '{{', '}': '}}', '\\': '\\\\', '"': '\\"'})
 
 # `$"Hello, {name}"`
 class InterpolatedStringLiteral(Literal):
     """f-string style literal with $"text {expr} more text" syntax"""
+    __slots__ = ('parts',)
+
     def __init__(self, template: str):
         super().__init__(NodeType.F_STRINGLiteral, value=template)
         self.parts = self._parse_template(template)
 
     def _parse_template(self, template: str) -> List[Union[str, ASTNode]]:
         # Accept forms like $"...". Extract inner content between the outermost quotes.
-        m = re.match(r'^\$([\'"])(.*)\1$', template, re.S)
+        m = _FSTRING_QUOTES.match(template)
         inner = m.group(2) if m else template
 
         parts: List[Union[str, ASTNode]] = []
         cur = []
         i = 0
         n = len(inner)
+        match = _FSTRING_PART.match
         while i < n:
-            ch = inner[i]
-            if ch == '{':
-                # find matching closing brace, handle nested braces
+            m = match(inner, i)
+            expr = m.group(1)
+            j = m.end()
+            if expr is None and m.group() == '{':
+                # lone `{`: unmatched, or nested deeper than the regex handles
                 j = i + 1
                 depth = 1
                 while j < n and depth > 0:
@@ -734,52 +1029,47 @@ class InterpolatedStringLiteral(Literal):
                         depth -= 1
                     j += 1
                 if depth == 0:
-                    # flush current literal
-                    if cur:
-                        parts.append(''.join(cur))
-                        cur = []
-                    expr = inner[i+1:j-1].strip()
-                    # treat expression as an identifier (caller may replace with real AST node)
-                    parts.append(Identifier(expr))
-                    i = j
-                    continue
+                    expr = inner[i+1:j-1]
                 else:
-                    # unmatched brace -> treat as literal
-                    cur.append(ch)
-                    i += 1
-            else:
-                cur.append(ch)
-                i += 1
+                    j = i + 1
+            i = j
+            if expr is None:
+                # literal text (or an unmatched brace)
+                cur.append(m.group())
+                continue
+            # flush current literal
+            if cur:
+                parts.append(''.join(cur))
+                cur = []
+            # treat expression as an identifier (caller may replace with real AST node)
+            parts.append(Identifier.intern(expr.strip()))
 
         if cur:
             parts.append(''.join(cur))
         return parts
 
-    def To_CXX(self) -> str:
-        fmt_parts: List[str] = []
-        args: List[str] = []
+    def _parts(self) -> List[Any]:
+        out: List[Any] = ['runtime::format("']
+        args: List[ASTNode] = []
         for part in self.parts:
             if isinstance(part, str):
                 # Escape braces (for formatting), backslashes and double quotes for C++ literal
-                p = (part
-                     .replace('{', '{{')
-                     .replace('}', '}}')
-                     .replace('\\', '\\\\')
-                     .replace('"', '\\"'))
-                fmt_parts.append(p)
+                out.append(part.translate(_FORMAT_ESCAPES))
             else:
-                fmt_parts.append("{}")
-                args.append(part.To_CXX())
-
-        fmt = ''.join(fmt_parts)
-        if args:
-            return f'runtime::format("{fmt}", {", ".join(args)})'
-        else:
-            return f'runtime::format("{fmt}")'
+                out.append("{}")
+                args.append(part)
+        out.append('"')
+        for arg in args:
+            out.append(", ")
+            out.append(arg)
+        out.append(')')
+        return out
 
 # `true, false`
 class BoolLiteral(Literal):
     """Boolean literal (true/false)"""
+    __slots__ = ()
+
     def __init__(self, value: bool):
         super().__init__(NodeType.BOOLLiteral)
         self.value = value
@@ -788,8 +1078,10 @@ class BoolLiteral(Literal):
         return "true" if self.value else "false"
 
 # `void`
-class VoidLiteral(Literal):
+class VoidLiteral(_Stateless, Literal):
     """Void literal (no value)"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.VOIDLiteral)
 
@@ -797,8 +1089,10 @@ class VoidLiteral(Literal):
         return "void"
 
 # `nullptr`
-class NullPtrLiteral(Literal):
+class NullPtrLiteral(_Stateless, Literal):
     """Void literal (no value)"""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.NULLPTRLiteral)
 
@@ -812,28 +1106,33 @@ class NullPtrLiteral(Literal):
 
 class FuncDeclParam(ASTNode):
     """Represents a single parameter in function declaration with default value"""
+    __slots__ = ('name', 'param_type', 'default')
+
     def __init__(self, 
                  name: Identifier,
                  param_type: Identifier,
                  default: Optional[ASTNode] = None):
         super().__init__(NodeType.FUNC_PARAM)
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
-        self.param_type = param_type if isinstance(param_type, Identifier) else Identifier(param_type)
+        self.name = _as_id(name)
+        self.param_type = _as_id(param_type)
         self.default = default
 
     def To_CXX(self) -> str:
-        type_str = ConvertType(self.param_type.To_CXX())
-        default_str = f" = {self.default.To_CXX()}" if self.default else ""
-        return f"{type_str} {self.name.To_CXX()}{default_str}"
+        decl = f"{ConvertType(self.param_type.To_CXX())} {self.name.To_CXX()}"
+        if self.default:
+            return f"{decl} = {self.default.To_CXX()}"
+        return decl
 
 class FuncCallParam(ASTNode):
     """Represents a function call parameter (both named and positional)"""
+    __slots__ = ('name',)
+
     def __init__(self, 
                  value: ASTNode,
                  name: Optional[Identifier] = None):
         super().__init__(NodeType.FUNC_CALL_PARAM)
         self.value = value
-        self.name = name if isinstance(name, Identifier) else Identifier(name) if name else None
+        self.name = _as_id(name) if name else None
 
     def To_CXX(self) -> str:
         if self.name:
@@ -841,68 +1140,74 @@ class FuncCallParam(ASTNode):
         return self.value.To_CXX()
 
 class FunctionCall(Value, ASTNode):
+    __slots__ = ('target', 'params', 'generic_params')
+
     def __init__(self, 
                  target: Identifier,
                  params: List[FuncCallParam],
-                 generic_params: List["GenericParam"] = []):
+                 generic_params: Optional[List["GenericParam"]] = None):
         super().__init__(NodeType.FUNCTION_CALL)
-        self.target = target if isinstance(target, ASTNode) else Identifier(target)
-        self.params = [FuncCallParam(p) if not isinstance(p, FuncCallParam) else p for p in params]
-        self.generic_params = generic_params or []
+        self.target = target if isinstance(target, ASTNode) else Identifier.intern(target)
+        self.params = tuple(FuncCallParam(p) if not isinstance(p, FuncCallParam) else p for p in params)
+        self.generic_params = tuple(generic_params or ())
 
-    def _template(self):
-        return f"<{', '.join(p.To_CXX() for p in self.generic_params)}>\n" if self.generic_params else ""
+    def _template(self) -> str:
+        return f"<{', '.join([p.To_CXX() for p in self.generic_params])}>\n" if self.generic_params else ""
 
-    def To_CXX(self) -> str:
+    def _parts(self) -> List[Any]:
         # All function calls use the parameter struct
-        args = []
+        parts: List[Any] = [self.target, self._template(), "("]
         for i, param in enumerate(self.params):
+            if i:
+                parts.append(", ")
             if param.name:
-                args.append(f"_{param.name.To_CXX()}={param.value.To_CXX()}")
-            else:
-                args.append(f"{param.value.To_CXX()}")
-        
-        return f"{self.target.To_CXX()}{self._template()}({', '.join(args)})"
+                parts.append(f"_{param.name.To_CXX()}=")
+            parts.append(param.value)
+        parts.append(")")
+        return parts
 
 class MemberInit(ASTNode):
     """Represents a member initializer entry like 'x(x)'"""
+    __slots__ = ('name', 'expr')
+
     def __init__(self, name: Union[str, Identifier], expr: Union[ASTNode, str]):
         super().__init__(NodeType.VAR_ASSIGN)
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
-        self.expr = expr if isinstance(expr, ASTNode) else Identifier(str(expr))
+        self.name = _as_id(name)
+        self.expr = expr if isinstance(expr, ASTNode) else Identifier.intern(str(expr))
 
     def To_CXX(self) -> str:
         return f"{self.name.To_CXX()}({self.expr.To_CXX()})"
     
-class FunctionDecl(ASTNode):
+class FunctionDecl(_HeaderCache, ASTNode):
+    __slots__ = ('name', 'return_type', 'params', 'generic_params', 'var_assigns', '_header')
+    body = _LazyBody('body')
+
     def __init__(self, 
                  name: Identifier,
                  params: List[FuncDeclParam],
                  return_type: Optional[Identifier] = "",
-                 generic_params: List["GenericParam"] = [],
-                 body: Body = None,
-                 modifiers: List[Modifier] = [],
-                 var_assigns: List[FunctionCall] = []):
-        super().__init__(NodeType.FUNCTION_DECL, body=body or Body([]))
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
-        self.return_type = return_type if isinstance(return_type, Identifier) else Identifier(return_type)
-        self.params = params
-        self.generic_params = generic_params or []
-        self.modifiers = modifiers or []
-        self.var_assigns = var_assigns or []
-
-    def To_CXX(self) -> str:
-        param_list = ', '.join(p.To_CXX() for p in self.params)
-        mods = ' '.join(ConvertModifier(m) for m in self.modifiers) + " " if self.modifiers else ""
-        body = self.body.To_CXX()
-        return_type = ConvertType(self.return_type.To_CXX()) or ""
-        generic_str = ''
+                 generic_params: Optional[List["GenericParam"]] = None,
+                 body: Optional[Body] = None,
+                 modifiers: Optional[List[Modifier]] = None,
+                 var_assigns: Optional[List[FunctionCall]] = None):
+        # An empty body stays None until something reads `body`
+        super().__init__(NodeType.FUNCTION_DECL, body=body or None, modifiers=modifiers)
+        self.name = _as_id(name)
+        self.return_type = _as_id(return_type)
+        self.params = tuple(params)
+        self.generic_params = tuple(generic_params or ())
+        self.var_assigns = tuple(var_assigns or ())
+
+    def _signature(self) -> str:
+        header: List[str] = []
         if self.generic_params:
-            generic_str = f"template<{', '.join(p.To_CXX() for p in self.generic_params)}>\n"
-            mods = generic_str + mods if mods else generic_str
+            header.append(f"template<{', '.join([p.To_CXX() for p in self.generic_params])}>\n")
+        if self.modifiers:
+            header += [_join_modifiers(self.modifiers), " "]
+        header += [ConvertType(self.return_type.To_CXX()), " ", self.name.To_CXX(),
+                   "(", ', '.join([p.To_CXX() for p in self.params]), ")"]
 
         # Build initializer list (member-initializers) if provided
-        init_list = ""
         if self.var_assigns:
             inits = []
             for va in self.var_assigns:
@@ -911,18 +1216,25 @@ class FunctionDecl(ASTNode):
                 elif isinstance(va, FunctionCall):
                     # convert simple FunctionCall -> name(args...)
                     target_name = va.target.To_CXX()
-                    args = ', '.join(p.value.To_CXX() for p in va.params) if va.params else ""
+                    args = ', '.join([p.value.To_CXX() for p in va.params]) if va.params else ""
                     inits.append(f"{target_name}({args})")
                 elif isinstance(va, ASTNode):
                     # fall back to its To_CXX()
                     inits.append(va.To_CXX())
                 else:
                     inits.append(str(va))
-            init_list = " : " + ", ".join(inits)
+            header += [" : ", ", ".join(inits)]
 
-        return f"{mods}{return_type} {self.name.To_CXX()}({param_list}){init_list}{{\n{body}\n}}"
+        header.append("{\n")
+        return ''.join(header)
+
+    def _parts(self) -> List[Any]:
+        body = FunctionDecl.body.peek(self)
+        return [self._cached_header(), body if body is not None else "", "\n}"]
 
 class LambdaExpr(Value, ASTNode):
+    __slots__ = ('params', 'return_type', 'capture')
+
     def __init__(self, 
                  params: List[Tuple[Identifier, 
                                    Identifier]],
@@ -930,26 +1242,26 @@ class LambdaExpr(Value, ASTNode):
                  return_type: Identifier = "",
                  capture: str = "[]"):
         super().__init__(NodeType.LAMBDA_EXPR, body=body)
-        self.params = [(name if isinstance(name, Identifier) else Identifier(str(name)),
-                        type_ if isinstance(type_, Identifier) else Identifier(str(type_))) for name, type_ in params]
-        self.return_type = return_type if isinstance(return_type, Identifier) else Identifier(return_type)
+        self.params = tuple((_as_id(name), _as_id(type_)) for name, type_ in params)
+        self.return_type = _as_id(return_type)
         self.capture = capture 
 
-    def To_CXX(self) -> str:
+    def _parts(self) -> List[Any]:
         params_str = ', '.join(
-            f"{ConvertType(type_.To_CXX())} {name.To_CXX()}"
-            for name, type_ in self.params
+            [f"{ConvertType(type_.To_CXX())} {name.To_CXX()}"
+             for name, type_ in self.params]
         )
         return_str = f" -> {ConvertType(self.return_type.To_CXX())}" if self.return_type else ""
-        body_str = self.body.To_CXX()
-        return f"[{self.capture}]({params_str}){return_str} {{\n{body_str}\n}}".lstrip()
+        return [f"[{self.capture}]({params_str}){return_str} {{\n", self.body, "\n}"]
 
 class Return(ASTNode):
+    __slots__ = ()
+
     def __init__(self, value: Optional["Value"]):  # None for void returns
         super().__init__(NodeType.RETURN, value=value if value else None)
 
-    def To_CXX(self):
-        return f"return {self.value.To_CXX()};" if self.value else "return;"
+    def _parts(self) -> List[Any]:
+        return ["return ", self.value, ";"] if self.value else ["return;"]
 
 # ==============================================
 # OOP
@@ -957,13 +1269,15 @@ class Return(ASTNode):
 
 class GenericParam(ASTNode):
     """Represents a template parameter (type or non-type)"""
+    __slots__ = ('name', 'param_type', 'default', 'is_type')
+
     def __init__(self, 
                  name: Identifier, 
                  param_type: Optional[Identifier] = None,
                  default: Optional[ASTNode] = None,
                  is_type: bool = True):
         super().__init__(NodeType.GENERIC_PARAM)
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
+        self.name = _as_id(name)
         self.param_type = param_type
         self.default = default
         self.is_type = is_type
@@ -979,42 +1293,47 @@ class GenericParam(ASTNode):
             decl += f" = {self.default.To_CXX()}"
         return decl
 
-class ClassNode(ASTNode):
+class ClassNode(_HeaderCache, ASTNode):
+    __slots__ = ('name', 'generic_params', 'parents', '_header')
+    body = _LazyBody('body')
+
     def __init__(self,
                 name: Identifier,
-                body: Body = Body([]),
-                generic_params: List["GenericParam"] = [],
-                parents: List[Union[str, "Identifier"]] = [], 
-                modifiers: List["Modifier"] = []):
-        super().__init__(NodeType.CLASS_DEFINE, body=body)
-        self.name = name if isinstance(name, Identifier) else Identifier(name)
-        self.generic_params = generic_params or []
-        self.parents = [p if isinstance(p, (Identifier, ASTNode)) else Identifier(p) for p in (parents or [])]
-        self.modifiers = modifiers or []
-
-        names = [p.name.To_CXX() for p in generic_params]
+                body: Optional[Body] = None,
+                generic_params: Optional[List["GenericParam"]] = None,
+                parents: Optional[List[Union[str, "Identifier"]]] = None, 
+                modifiers: Optional[List["Modifier"]] = None):
+        super().__init__(NodeType.CLASS_DEFINE, body=body, modifiers=modifiers)
+        self.name = _as_id(name)
+        self.generic_params = tuple(generic_params or ())
+        self.parents = tuple(p if isinstance(p, ASTNode) else Identifier.intern(p) for p in (parents or ()))
+
+        names = [p.name.To_CXX() for p in self.generic_params]
         assert len(names) == len(set(names)), "Duplicate generic parameter names"
 
-    def To_CXX(self) -> str:
-        body_content = self.body.To_CXX()
-        return (
-            self._template() +
-            " ".join(ConvertModifier(m) for m in self.modifiers) if self.modifiers else "" +
-            f"class {self.name.To_CXX()}{self._parents()} {{\n{body_content}\n}};"
-        )
-
-    def _template(self):
-        return f"template<{', '.join(p.To_CXX() for p in self.generic_params)}>\n" if self.generic_params else ""
+    def _signature(self) -> str:
+        header: List[str] = []
+        if self.generic_params:
+            header.append(f"template<{', '.join([p.To_CXX() for p in self.generic_params])}>\n")
+        if self.modifiers:
+            header += [_join_modifiers(self.modifiers), " "]
+        header += ["class ", self.name.To_CXX()]
+        if self.parents:
+            header += [" : public ", ", ".join([p.To_CXX() for p in self.parents])]
+        header.append(" {\n")
+        return ''.join(header)
 
-    def _parents(self):
-        if not self.parents: return ""
-        return " : public " + ", ".join(p.To_CXX() if isinstance(p, ASTNode) else str(p) for p in self.parents)
+    def _parts(self) -> List[Any]:
+        body = ClassNode.body.peek(self)
+        return [self._cached_header(), body if body is not None else "", "\n};"]
 
 class ClassDivider(ASTNode):
     """Divides class body into sections based on access modifiers"""
+    __slots__ = ()
+
     def __init__(self, 
                  access: Identifier):
-        super().__init__(NodeType.CLASS_DIVIDER, value=access if isinstance(access, Identifier) else Identifier(access))
+        super().__init__(NodeType.CLASS_DIVIDER, value=_as_id(access))
 
     def To_CXX(self) -> str:
         access_str = self.value.To_CXX().lower() if hasattr(self, "value") and self.value is not None else "public"
@@ -1025,31 +1344,35 @@ class ClassDivider(ASTNode):
 # ==============================================
 
 class IfExpr(ASTNode):
+    __slots__ = ('condition', 'elifs', '_else_body')
+    else_body = _LazyBody('_else_body')
+
     def __init__(self, condition: ASTNode, 
                  body: Body,
-                 elifs: List[Tuple[ASTNode, Body]] = [],
-                 else_body: Body = []):
+                 elifs: Optional[List[Tuple[ASTNode, Body]]] = None,
+                 else_body: Optional[Body] = None):
         super().__init__(NodeType.IF_EXPR, body=body)
         self.condition = condition
-        self.elifs = [(pattern, elseif if isinstance(elseif, list) else Body(elseif.children, 1)) for pattern, elseif in elifs]
-        self.else_body = else_body if isinstance(else_body, Body) else Body(else_body or [], 1)
+        # Wrap every elif branch in a Body here so emitting needs no checks
+        self.elifs = tuple((pattern, Body(elseif, 1)) for pattern, elseif in elifs or ())
+        # No else branch -> None until something reads `else_body`
+        self.else_body = else_body if isinstance(else_body, Body) else Body(else_body, 1) if else_body else None
 
-    def To_CXX(self) -> str:
-        result = f"if ({self.condition.To_CXX()}) {{\n{self.body.To_CXX()}\n}}"
+    def _parts(self) -> List[Any]:
+        result = ["if (", self.condition, ") {\n", self.body, "\n}"]
         
         for cond, body in self.elifs:
-            if isinstance(body, Body):
-                body_cxx = body.To_CXX()
-            else:
-                body_cxx = Body(body if isinstance(body, list) else body.children, 1).To_CXX()
-            result += f" else if ({cond.To_CXX()}) {{\n{body_cxx}\n}}"
+            result += [" else if (", cond, ") {\n", body, "\n}"]
             
-        if self.else_body and (self.else_body.children):
-            result += f" else {{\n{self.else_body.To_CXX()}\n}}"
+        else_body = IfExpr.else_body.peek(self)
+        if else_body is not None and else_body.children:
+            result += [" else {\n", else_body, "\n}"]
             
         return result
 
 class TernaryExpr(Value, ASTNode):
+    __slots__ = ('condition', 'true_expr', 'false_expr')
+
     def __init__(self, condition: ASTNode, 
                  true_expr: ASTNode, 
                  false_expr: ASTNode):
@@ -1058,55 +1381,62 @@ class TernaryExpr(Value, ASTNode):
         self.true_expr = true_expr
         self.false_expr = false_expr
 
-    def To_CXX(self) -> str:
-        return f"{self.condition.To_CXX()} ? {self.true_expr.To_CXX()} : {self.false_expr.To_CXX()}"
+    def _parts(self) -> List[Any]:
+        return [self.condition, " ? ", self.true_expr, " : ", self.false_expr]
 
 class Case(ASTNode):
     """Case syntax"""
+    __slots__ = ()
+
     def __init__(self, case: Value, body: Body):
         super().__init__(NodeType.CASE, case, body)
 
-    def To_CXX(self):
-        # use the stored value and body properly formatted
-        case_val = self.value.To_CXX() if hasattr(self, "value") and self.value is not None else ""
-        body_cxx = self.body.To_CXX() if hasattr(self, "body") and self.body is not None else ""
-        return f"case {case_val}:\n{body_cxx}"
+    def _parts(self) -> List[Any]:
+        return ["case ", self.value if self.value is not None else "", ":\n",
+                self.body if self.body is not None else ""]
 
 class Switch(ASTNode):
     """Switch case syntax"""
+    __slots__ = ()
+
     def __init__(self, subject: Value, cases: Body):
         # keep value/cases in the same attributes used elsewhere
         super().__init__(NodeType.SWITCH, value=subject, body=cases)
 
-    def To_CXX(self):
-        subj = self.value.To_CXX() if hasattr(self, "value") and self.value is not None else ""
-        body_cxx = self.body.To_CXX() if hasattr(self, "body") and self.body is not None else ""
-        return f"switch({subj}) {{\n{body_cxx}\n}}"
+    def _parts(self) -> List[Any]:
+        return ["switch(", self.value if self.value is not None else "", ") {\n",
+                self.body if self.body is not None else "", "\n}"]
 
 # ==============================================
 # Loops
 # ==============================================
 
 class WhileLoop(ASTNode):
+    __slots__ = ('condition',)
+
     def __init__(self, condition: ASTNode, body: Body):
         super().__init__(NodeType.WHILE_LOOP, body=body)
         self.condition = condition
 
-    def To_CXX(self) -> str:
-        return f"while ({self.condition.To_CXX()}) {{\n{self.body.To_CXX()}\n}}"
+    def _parts(self) -> List[Any]:
+        return ["while (", self.condition, ") {\n", self.body, "\n}"]
 
 class ForInLoop(ASTNode):
+    __slots__ = ('var_name', 'iterable')
+
     def __init__(self, var_name: Identifier,
                  iterable: ASTNode,
                  body: Body):
         super().__init__(NodeType.FOR_IN_LOOP, body=body)
-        self.var_name = var_name if isinstance(var_name, Identifier) else Identifier(var_name)
+        self.var_name = _as_id(var_name)
         self.iterable = iterable
 
-    def To_CXX(self) -> str:
-        return f"for (auto&& {self.var_name.To_CXX()} : {self.iterable.To_CXX()}) {{\n{self.body.To_CXX()}\n}}"
+    def _parts(self) -> List[Any]:
+        return [f"for (auto&& {self.var_name.To_CXX()} : ", self.iterable, ") {\n", self.body, "\n}"]
 
 class CStyleForLoop(ASTNode):
+    __slots__ = ('init', 'condition', 'update')
+
     def __init__(self, init: ASTNode,
                  condition: ASTNode,
                  update: ASTNode,
@@ -1116,18 +1446,21 @@ class CStyleForLoop(ASTNode):
         self.condition = condition
         self.update = update
 
-    def To_CXX(self) -> str:
-        return (f"for ({self.init.To_CXX()} {self.condition.To_CXX()}; {self.update.To_CXX()}) "
-                f"{{\n{self.body.To_CXX()}\n}}")
+    def _parts(self) -> List[Any]:
+        return ["for (", self.init, " ", self.condition, "; ", self.update, ") {\n", self.body, "\n}"]
+
+class Break(_Stateless, ASTNode):
+    __slots__ = ()
 
-class Break(ASTNode):
     def __init__(self):
         super().__init__(NodeType.BREAK)
 
     def To_CXX(self) -> str:
         return "break;"
 
-class Continue(ASTNode):
+class Continue(_Stateless, ASTNode):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(NodeType.CONTINUE)
 
@@ -1139,35 +1472,34 @@ class Continue(ASTNode):
 # ==============================================
 
 class TryCatch(ASTNode):
+    __slots__ = ('try_body', 'catch_blocks', 'finally_body')
+
     def __init__(self, try_body: Body, 
                  catch_blocks: List[Tuple[Identifier, Body]],
-                 finally_body: Optional[Body] = []):
+                 finally_body: Optional[Body] = None):
         super().__init__(NodeType.TRY_CATCH, body=try_body)
         self.try_body = try_body
-        self.catch_blocks = [(exception_type if isinstance(exception_type, Identifier) else Identifier(str(exception_type)), body if isinstance(body, Body) else Body(body or [], 1)) 
-                            for exception_type, body in catch_blocks]
+        self.catch_blocks = tuple((_as_id(exception_type), body if isinstance(body, Body) else Body(body or [], 1)) 
+                                  for exception_type, body in catch_blocks)
         self.finally_body = finally_body if isinstance(finally_body, Body) else Body(finally_body or [], 1) if finally_body else None
 
-    def To_CXX(self) -> str:
-        try_block = f"try {{\n{self.body.To_CXX()}\n}}"
-        
-        catch_blocks_str = ""
+    def _parts(self) -> List[Any]:
+        parts: List[Any] = ["try {\n", self.body, "\n}"]
         for exc_type, body in self.catch_blocks:
-            catch_blocks_str += f" catch ({ConvertType(exc_type.To_CXX())} e) {{\n{body.To_CXX()}\n}}"
-        
-        finally_block = ""
+            parts += [f" catch ({ConvertType(exc_type.To_CXX())} e) {{\n", body, "\n}"]
         if self.finally_body:
-            finally_block = f" finally {{\n{self.finally_body.To_CXX()}\n}}"
-        
-        return try_block + catch_blocks_str + finally_block
+            parts += [" finally {\n", self.finally_body, "\n}"]
+        return parts
 
 class Throw(ASTNode):
+    __slots__ = ('exception',)
+
     def __init__(self, exception: ASTNode):
         super().__init__(NodeType.THROW)
         self.exception = exception
 
-    def To_CXX(self) -> str:
-        return f"throw {self.exception.To_CXX()};"
+    def _parts(self) -> List[Any]:
+        return ["throw ", self.exception, ";"]
 
 def main() -> int:
     test = Identifier("myVar**")
@@ -0,0 +1,163 @@
+import pytest
+
+from scripts.ASTLib import *
+
+# Placeholders nested deeper than the fast-path regex fall back to brace counting
+def test_interpolated_string_deep_nesting():
+    assert InterpolatedStringLiteral('$"a{b{c{d{e}}}}f"').To_CXX() == 'runtime::format("a{}f", b{c{d{e}}})'
+    assert InterpolatedStringLiteral('$"{a{b{c{d{e}}}}} and {x}"').To_CXX() == 'runtime::format("{} and {}", a{b{c{d{e}}}}, x)'
+    assert InterpolatedStringLiteral('$"open { only"').To_CXX() == 'runtime::format("open {{ only")'
+
+# Only str names share pooled Identifiers; equal-hashing keys must not collide
+def test_identifier_intern_keys():
+    assert Identifier.intern("1").To_CXX() == "1"
+    assert Identifier.intern(True).To_CXX() == "True"
+    assert Identifier.intern(1.0).To_CXX() == "1.0"
+    assert Identifier.intern(["a"]).To_CXX() == "['a']"
+    assert Identifier.intern("x") is Identifier.intern("x")
+
+# Non-str names coerced through _as_id keep their own text
+def test_coerced_names():
+    lam = LambdaExpr([(True, "int"), (1, "int")], Body([]), "int")
+    assert [name.To_CXX() for name, _ in lam.params] == ["True", "1"]
+    tc = TryCatch(Body([]), [(1.0, Body([Comment("x")]))])
+    assert tc.catch_blocks[0][0].To_CXX() == "1.0"
+
+# Absent bodies are built on first access, so they can still be filled in later
+def test_lazy_bodies():
+    func = FunctionDecl("f", [], "void")
+    assert func.To_CXX() == "void f(){\n\n}"
+    func.body.add_statement(Return(NumericLiteral("1")))
+    assert func.To_CXX() == "void f(){\n    return 1;\n}"
+
+    cls = ClassNode("C")
+    cls.body.add_statement(ClassDivider("PUBLIC"))
+    assert cls.To_CXX() == "class C {\n    public:\n};"
+
+    cond = IfExpr(BoolLiteral(True), Body([Break()]))
+    assert cond.To_CXX() == "if (true) {\n    break;\n}"
+    cond.else_body.add_statement(Continue())
+    assert cond.To_CXX() == "if (true) {\n    break;\n} else {\n    continue;\n}"
+
+# Golden output for the stack-driven emitter: nested bodies, branches, switch, try and empty blocks
+def test_emit_golden():
+    loop = WhileLoop(Identifier("running"), Body([
+        IfExpr(BinaryExpression(Identifier("n"), ">", NumericLiteral("0")),
+               Body([UnaryIncrementExpression("--", Identifier("n"), False)]),
+               [(BinaryExpression(Identifier("n"), "==", NumericLiteral("0")), Body([Break()]))],
+               Body([Continue()])),
+    ]))
+    switch = Switch(Identifier("n"), Body([
+        Case(NumericLiteral("1"), Body([FunctionCall("f", []), Break()])),
+        Case(NumericLiteral("2"), Body([Return(Identifier("n"))])),
+    ]))
+    trycatch = TryCatch(Body([Throw(FunctionCall("std::runtime_error", [NormalStringLiteral("bad")]))]),
+                        [(Identifier("std::exception"), Body([Comment("ignored")]))])
+    box = ClassNode("Box", Body([ClassDivider("PUBLIC"), VarDeclareAssign(Identifier("item"), Identifier("T"))]),
+                    [GenericParam("T")], ["Base"], [IsConstModifier(), IsStaticModifier()])
+    program = Program(Body([
+        FunctionDecl("run", [FuncDeclParam("n", "int")], "void", body=Body([loop, switch, trycatch])),
+        FunctionDecl("noop", [], "void", body=Body([])),
+        IfExpr(BoolLiteral(True), Body([])),
+        AnnotationNamespace("ns", [box, ClassNode("Empty")]),
+    ]))
+    assert program.To_CXX() == '''#include "runtime2.hpp"
+
+void run(IntWrapper n){
+    while (running) {
+        if (n > 0) {
+            n--;
+        } else if (n == 0) {
+            break;
+        } else {
+            continue;
+        }
+    }
+    switch(n) {
+        case 1:
+            f();
+            break;
+        case 2:
+            return n;
+    }
+    try {
+        throw std::runtime_error("bad");
+    } catch (std::exception e) {
+        // ignored
+    }
+}
+void noop(){
+
+}
+if (true) {
+
+}
+namespace ns {
+    template<typename T>
+    const static class Box : public Base {
+        public:
+        T item;
+    };
+    class Empty {
+    
+    };
+}'''
+
+# The class header keeps its template line, modifiers and body together
+def test_class_header():
+    cls = ClassNode("Pair", Body([ClassDivider("PUBLIC")]), [GenericParam("K"), GenericParam("V")],
+                    modifiers=[IsStaticModifier()])
+    assert cls.To_CXX() == "template<typename K, typename V>\nstatic class Pair {\n    public:\n};"
+    assert ClassNode("Plain", generic_params=[GenericParam("T")]).To_CXX().startswith("template<typename T>\nclass Plain {")
+
+# Cached declaration headers follow later edits to the node
+def test_function_header_edits():
+    func = FunctionDecl("f", [], "void")
+    assert func.To_CXX() == "void f(){\n\n}"
+    func.name = Identifier("g")
+    func.params = (FuncDeclParam("x", "float"),)
+    func.modifiers = (IsStaticModifier(),)
+    assert func.To_CXX() == "static void g(FloatWrapper x){\n\n}"
+
+# ClassNode shares FunctionDecl's header cache policy
+def test_class_header_edits():
+    cls = ClassNode("C")
+    assert cls.To_CXX() == "class C {\n\n};"
+    cls.parents = (Identifier("Base"),)
+    cls.generic_params = (GenericParam("T"),)
+    assert cls.To_CXX() == "template<typename T>\nclass C : public Base {\n\n};"
+
+# Call arguments are rendered from `params` at emit time
+def test_function_call_params_edits():
+    call = FunctionCall("f", [NumericLiteral("1")])
+    assert call.To_CXX() == "f(1)"
+    call.params += (FuncCallParam(NumericLiteral("2"), "end"),)
+    assert call.To_CXX() == "f(1, _end=2)"
+
+# Catch and finally clauses are rendered from the node's fields at emit time
+def test_try_catch_edits():
+    tc = TryCatch(Body([Break()]), [])
+    assert tc.To_CXX() == "try {\n    break;\n}"
+    tc.catch_blocks += ((Identifier("int"), Body([Continue()])),)
+    tc.finally_body = Body([Comment("done")])
+    assert tc.To_CXX() == "try {\n    break;\n} catch (IntWrapper e) {\n    continue;\n} finally {\n    // done\n}"
+
+# Parameter declarations are rendered from name and param_type at emit time
+def test_func_decl_param_edits():
+    param = FuncDeclParam("x", "int")
+    assert param.To_CXX() == "IntWrapper x"
+    param.name = Identifier("y")
+    param.param_type = Identifier("float")
+    assert param.To_CXX() == "FloatWrapper y"
+
+# Negative indent levels render flush, as "    " * level always did
+def test_negative_indent_level():
+    assert Body([Break()], -1).To_CXX() == "break;"
+
+# Stateless nodes are one shared, unmodifiable instance per class
+def test_stateless_nodes_are_shared():
+    assert Break() is Break() and NewLine() is NewLine()
+    assert Break() is not Continue()
+    with pytest.raises(AttributeError):
+        Break().value = "x"
+    assert Break().value is None and Break().To_CXX() == "break;"